@@ -1,16 +1,19 @@
 #!/usr/bin/env python3
 """
 Entry point script to run Alpha voice assistant.
-This script handles the proper module imports and starts Alpha.
+Equivalent to `python -m voice_assistant` from the repository root.
 """
 
-import sys
 import os
+import sys
 
-# Add the current directory to Python path so we can import voice_assistant
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Bytecode for a read-only install can't be cached next to the sources, which
+# would recompile every module on every launch. Cache it per-user instead.
+_package_dir = os.path.join(os.path.dirname(__file__), "voice_assistant")
+if sys.pycache_prefix is None and not os.access(_package_dir, os.W_OK):
+    sys.pycache_prefix = os.path.join(os.path.expanduser("~"), ".cache", "alpha", "pycache")
 
-# Now we can import and run the main function
+# The script's directory is already first on sys.path, so the package imports directly
 from voice_assistant.main import main
 
 if __name__ == "__main__":
@@ -4,9 +4,18 @@ Simple test script to verify the voice assistant components work correctly.
 Run this before using the full assistant to check for basic issues.
 """
 
+import importlib.util
 import os
 import sys
 
+def _module_available(module):
+    """Check whether a module can be imported without actually importing it."""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ImportError:
+        # find_spec imports parent packages, e.g. 'google' for 'google.genai'
+        return False
+
 def test_imports():
     """Test that all modules can be imported successfully."""
     print("Testing imports...")
@@ -77,18 +86,16 @@ def test_dependencies():
     all_good = True
     
     for module in required_modules:
-        try:
-            __import__(module)
+        if _module_available(module):
             print(f"✓ {module} is available")
-        except ImportError:
+        else:
             print(f"✗ {module} is missing - required dependency")
             all_good = False
     
     for module in optional_modules:
-        try:
-            __import__(module)
+        if _module_available(module):
             print(f"✓ {module} is available (optional)")
-        except ImportError:
+        else:
             print(f"⚠ {module} is missing (optional - volume control may not work)")
     
     return all_good
@@ -114,7 +121,7 @@ def main():
     if all_passed:
         print("🎉 All tests passed! Alpha should work correctly.")
         print("\nTo run Alpha:")
-        print("  python voice_assistant/main.py")
+        print("  python -m voice_assistant")
     else:
         print("❌ Some tests failed. Please fix the issues above before running Alpha.")
         sys.exit(1)
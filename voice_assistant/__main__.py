@@ -0,0 +1,6 @@
+# Allows running Alpha with `python -m voice_assistant`
+
+from .main import main
+
+if __name__ == '__main__':
+    main()
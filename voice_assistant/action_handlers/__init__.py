@@ -0,0 +1,79 @@
+# voice_assistant/action_handlers/__init__.py
+# Dispatches NLU results to action handlers. Each handler module is imported
+# on first use, so startup doesn't pay for dependencies of unused actions.
+
+import importlib
+import logging
+
+try:
+    from ..config import EAGER_IMPORTS
+except ImportError:
+    from config import EAGER_IMPORTS
+
+logger = logging.getLogger(__name__)
+
+# --- Action Mapping Dictionary ---
+# Action type -> (handler submodule, handler function name)
+ACTION_MAP = {
+    "gemini_reply": (".ai", "handle_gemini_reply"),
+    "open_website": (".web", "handle_open_website"),
+    "open_application": (".system", "handle_open_application"),
+    "close_application": (".system", "handle_close_application"),
+    "youtube_search": (".media", "handle_youtube_search"),
+    "youtube_play": (".media", "handle_youtube_play"),
+    "web_search": (".web", "handle_web_search"),
+    "system_control": (".system", "handle_system_control"),
+    "volume_control": (".system", "handle_volume_control"),
+    "window_control": (".system", "handle_window_control"),
+    "file_io": (".files", "handle_file_io"),
+    "unknown": (".ai", "handle_unknown_action"),
+}
+
+# Handler functions resolved so far, keyed by action type
+_handler_cache = {}
+
+def _get_handler(action_type):
+    """Returns the handler for action_type, importing its module on first use."""
+    if action_type not in ACTION_MAP:
+        action_type = "unknown"
+
+    handler = _handler_cache.get(action_type)
+    if handler is None:
+        module_name, func_name = ACTION_MAP[action_type]
+        handler = getattr(importlib.import_module(module_name, __name__), func_name)
+        _handler_cache[action_type] = handler
+    return handler
+
+def prefetch_handler(action_type):
+    """
+    Imports the handler module for action_type ahead of execute_action, e.g.
+    while the rest of a streamed NLU reply is still arriving.
+    """
+    try:
+        _get_handler(action_type)
+    except Exception as e:
+        # execute_action will hit (and report) the same error later
+        logger.debug(f"Could not prefetch handler for '{action_type}': {e}")
+
+def execute_action(nlu_result, original_command: str) -> bool:
+    """
+    Looks up the action handler and executes it with the provided parameters.
+    Returns True if a follow-up listen is required (only for the 'unknown' action).
+    """
+    action_type = nlu_result.get('action')
+    params = nlu_result.get('parameters', {})
+    confidence = nlu_result.get('confidence', 0.0)
+    
+    logger.info(f"NLU Result: Action='{action_type}', Params={params}, Confidence={confidence}")
+
+    handler = _get_handler(action_type)
+    
+    # Execute the handler function and capture the relisten flag
+    relisten_needed = handler(params, original_command)
+        
+    return relisten_needed
+
+# Resolve every handler now so broken imports surface at startup
+if EAGER_IMPORTS:
+    for _action_type in ACTION_MAP:
+        _get_handler(_action_type)
@@ -0,0 +1,119 @@
+# voice_assistant/action_handlers/ai.py
+# Gemini replies and follow-up prompts for commands the NLU couldn't handle
+
+import os
+import logging
+import re
+from datetime import datetime
+
+try:
+    from ..voice_io import speak, listen_for_short_response
+except ImportError:
+    from voice_io import speak, listen_for_short_response
+
+logger = logging.getLogger(__name__)
+
+# Words that confirm a yes/no prompt (e.g. saving a Gemini reply)
+_AFFIRMATIVES = frozenset({'yes', 'yeah', 'yup', 'sure', 'save', 'ok', 'okay'})
+
+# Keyword patterns used to pick a follow-up prompt for unknown commands
+_EXPLAIN_RE = re.compile(r'\b(explain about|tell me about)\b')
+_PLAY_RE = re.compile(r'\bplay\b.*\b(song|video|on youtube)')
+_OPEN_RE = re.compile(r'\b(open|go to)\b')
+
+# Saved Gemini replies live in voice_assistant/responses.txt
+_RESPONSES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'responses.txt')
+_ENTRY_SEPARATOR = '=' * 60
+_ENTRY_DIVIDER = '-' * 60
+
+def handle_gemini_reply(params, original_command=None):
+    """Handles the 'gemini_reply' action by speaking the provided answer.
+
+    After speaking the answer, asks the user if they'd like to save the
+    response for later. If the user confirms, appends a nicely formatted
+    entry (timestamp, question, answer) to voice_assistant/responses.txt.
+    """
+    answer = params.get('answer')
+    if not answer:
+        speak("I received an empty response from the knowledge engine.")
+        return False
+
+    # Speak the answer first, minus any sentences already spoken while it streamed
+    remainder = answer[params.get('answer_spoken_chars', 0):].strip()
+    if remainder:
+        speak(remainder)
+
+    # Prompt the user to save the response
+    speak("Would you like me to save this response for later? Please say yes or no.")
+
+    # Listen for a short yes/no response (one retry if unclear).
+    # The retry reuses the same microphone session instead of reopening it.
+    try:
+        reply = listen_for_short_response(
+            retry_prompt="I didn't catch that. Do you want me to save it? Say yes or no.")
+    except Exception as e:
+        logger.debug(f"Error while listening for save confirmation: {e}")
+        reply = None
+
+    affirmative = False
+    if reply:
+        if not _AFFIRMATIVES.isdisjoint(reply.lower().split()):
+            affirmative = True
+
+    if not affirmative:
+        speak("Okay, I won't save it.")
+        return False
+
+    # Save the response to voice_assistant/responses.txt with a nice format
+    try:
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        question = original_command or params.get('question') or 'User query'
+
+        entry_lines = [
+            _ENTRY_SEPARATOR,
+            f"Saved: {timestamp}",
+            f"Question: {question}",
+            _ENTRY_DIVIDER,
+            answer.strip(),
+            "",
+        ]
+
+        with open(_RESPONSES_PATH, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(entry_lines) + '\n')
+
+        speak("Saved the response to my memory.")
+    except Exception as e:
+        logger.error(f"Failed to save response: {e}")
+        speak("Sorry, I couldn't save the response due to an error.")
+
+    return False
+
+
+def handle_unknown_action(params, original_command: str) -> bool:
+    """
+    Handles the 'unknown' action by analyzing the original command for missing info
+    and issuing a context-aware follow-up prompt.
+    Returns True if a follow-up listen is required, False otherwise.
+    """
+    reason = params.get('reason', 'Command not understood.')
+    
+    # Normalize command for easier keyword search
+    clean_command = original_command.lower().strip()
+
+    # --- Context-Aware Prompts ---
+    if _EXPLAIN_RE.search(clean_command):
+        speak("What do you want me to explain about?")
+        return True # Listen again
+    
+    elif _PLAY_RE.search(clean_command):
+        speak("What song or video should I play?")
+        return True # Listen again
+        
+    elif _OPEN_RE.search(clean_command):
+        speak("What application or website do you want me to open?")
+        return True # Listen again
+
+    # If the command is truly vague, use the generic response
+    speak(f"I'm sorry, I didn't understand the command. The NLU reason was: {reason}")
+    logger.warning(f"Unknown Command Handled. Reason: {reason}. Original: {original_command}")
+    return False # Action finished
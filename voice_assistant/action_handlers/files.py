@@ -0,0 +1,101 @@
+# voice_assistant/action_handlers/files.py
+# Note and file operations
+
+import os
+import logging
+
+try:
+    from ..voice_io import speak
+except ImportError:
+    from voice_io import speak
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of characters spoken when reading a file aloud
+_READ_PREVIEW_CHARS = 200
+
+def handle_file_io(params, original_command=None):
+    """
+    Handles advanced file operations: create, append, read, delete, and list directory contents.
+    Includes logic to ensure list/note files default to .txt extension for consistency.
+    """
+    operation = params.get('operation')
+    file_path = params.get('file_name', '.') 
+    content = params.get('content') or ''
+    
+    # --- FILE NAME STANDARDIZATION FIX ---
+    # If the operation is related to notes/lists/content, ensure a .txt extension exists
+    if operation in ['create', 'append', 'read', 'delete'] and file_path != '.':
+        # Check if file_path is already a directory name without an extension
+        if not os.path.splitext(file_path)[1] and not os.path.isdir(file_path):
+            file_path = f"{file_path}.txt"
+    # -------------------------------------
+
+    # If a file operation is requested, ensure a path is provided unless it's a 'list' of the current dir
+    if operation in ['create', 'append', 'read', 'delete'] and file_path == '.':
+        speak(f"Please specify a file name for the '{operation}' operation.")
+        return
+
+    try:
+        if operation == 'create':
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            speak(f"Successfully created or overwritten file {file_path}.")
+
+        elif operation == 'append':
+            # Notes are short, so write straight to the fd rather than through
+            # Python's buffered text layers. O_CREAT creates the file if needed
+            # and O_APPEND makes each write land atomically at EOF.
+            fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # Add content on a new line if the file is not empty and content is provided
+                if os.lseek(fd, 0, os.SEEK_END) > 0 and content.strip():
+                    payload = '\n' + content
+                else:
+                    payload = content
+                os.write(fd, payload.encode('utf-8'))
+            finally:
+                os.close(fd)
+            speak(f"Successfully added {content} to {file_path}.")
+
+        elif operation == 'read':
+            with open(file_path, 'r', encoding='utf-8') as f:
+                # Only read what we'll speak, plus one character to detect truncation
+                file_content = f.read(_READ_PREVIEW_CHARS + 1)
+            if file_content:
+                # Truncate content for speaking to avoid long responses
+                display_content = file_content[:_READ_PREVIEW_CHARS]
+                if len(file_content) > _READ_PREVIEW_CHARS:
+                    display_content += '...'
+                speak(f"The content of {file_path} is: {display_content}")
+            else:
+                speak(f"File {file_path} is empty.")
+                
+        elif operation == 'delete':
+            # ADVANCED: Delete file
+            os.remove(file_path)
+            speak(f"File {file_path} has been permanently deleted.")
+
+        elif operation == 'list':
+            # ADVANCED: List directory contents
+            items = os.listdir(file_path)
+            # Filter out hidden files/folders for cleaner output
+            items = [item for item in items if not item.startswith('.') and item not in ['..', '.']]
+            
+            if not items:
+                speak(f"The directory {file_path} is empty or doesn't exist.")
+            else:
+                speak(f"The contents of {file_path} are: {', '.join(items)}")
+
+        else:
+            speak(f"The file operation '{operation}' is not supported.")
+
+    except FileNotFoundError:
+        speak(f"Error: The file or directory '{file_path}' was not found.")
+    except PermissionError:
+        speak(f"Error: I do not have permission to access or modify '{file_path}'.")
+    except IsADirectoryError:
+        speak(f"Error: '{file_path}' is a directory. Please use the 'list' operation to view its contents.")
+    except Exception as e:
+        logger.error(f"File I/O Error: {e}")
+        speak(f"A general error occurred during the file operation on {file_path}.")
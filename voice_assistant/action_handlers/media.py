@@ -0,0 +1,32 @@
+# voice_assistant/action_handlers/media.py
+# YouTube search and playback
+
+import webbrowser
+from urllib.parse import quote_plus
+
+try:
+    from ..voice_io import speak
+except ImportError:
+    from voice_io import speak
+
+def handle_youtube_search(params, original_command=None):
+    """Handles the 'youtube_search' action."""
+    query = params.get('query')
+    if query:
+        url = f"https://www.youtube.com/results?search_query={quote_plus(query)}"
+        speak(f"Searching YouTube for: {query}")
+        webbrowser.open(url)
+    else:
+        speak("I need a search query for YouTube.")
+
+def handle_youtube_play(params, original_command=None):
+    """Handles the 'youtube_play' action."""
+    song_name = params.get('song_name')
+    artist = params.get('artist')
+    if song_name:
+        query = f"{song_name} {artist}" if artist else song_name
+        url = f"https://www.youtube.com/results?search_query={quote_plus(query)}"
+        speak(f"Playing {query} on YouTube.")
+        webbrowser.open(url)
+    else:
+        speak("I need a song or video name to play.")
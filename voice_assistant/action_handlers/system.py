@@ -0,0 +1,401 @@
+# voice_assistant/action_handlers/system.py
+# Applications, system power/lock commands, volume and window control
+
+import atexit
+import os
+import sys
+import subprocess
+import time
+import logging
+
+try:
+    from ..config import DEFAULT_VOLUME_STEP, EAGER_IMPORTS
+    from ..voice_io import speak
+except ImportError:
+    from config import DEFAULT_VOLUME_STEP, EAGER_IMPORTS
+    from voice_io import speak
+
+# pyautogui is imported inside handle_window_control, since loading it is slow
+# and fails on headless systems. EAGER_IMPORTS resolves it up front instead.
+if EAGER_IMPORTS:
+    import pyautogui
+
+logger = logging.getLogger(__name__)
+
+# One null device shared by every subprocess call, instead of subprocess.DEVNULL
+# opening and closing a fresh descriptor per call
+_DEVNULL_FD = os.open(os.devnull, os.O_RDWR)
+atexit.register(os.close, _DEVNULL_FD)
+
+# The platform can't change while we're running, so resolve it once
+_IS_WIN = sys.platform.startswith('win')
+_IS_MAC = sys.platform.startswith('darwin')
+_IS_LINUX = sys.platform.startswith('linux')
+
+# Common application mappings for cross-platform convenience
+_APP_MAPPING = {
+    'vscode': 'code',
+    'calculator': 'calc',
+    'notepad': 'notepad',
+    'chrome': 'google-chrome' if _IS_LINUX else 'chrome',
+    'spotify': 'spotify',
+    'cmd': 'cmd' if _IS_WIN else 'terminal',
+    'camera': 'microsoft.windows.camera:' if _IS_WIN else 'webcam'
+}
+
+# System commands for the current OS. None means the command is unsupported.
+if _IS_WIN:
+    _SYSTEM_COMMANDS = {
+        'lock': ['rundll32.exe', 'user32.dll,LockWorkStation'],
+        'shutdown': ['shutdown', '/s', '/t', '1'],
+        'restart': ['shutdown', '/r', '/t', '1'],
+        # This is an unreliable system command, often requiring third-party tools or admin rights
+        'sleep': None,
+    }
+elif _IS_MAC:
+    _SYSTEM_COMMANDS = {
+        'lock': ['/System/Library/CoreServices/Menu Extras/User.menu/Contents/Resources/CGSession', '-suspend'],
+        'shutdown': ['shutdown', '-h', 'now'],
+        'restart': ['shutdown', '-r', 'now'],
+        'sleep': ['pmset', 'sleepnow'],
+    }
+else: # Linux (Ubuntu/Gnome often uses this)
+    _SYSTEM_COMMANDS = {
+        'lock': ['gnome-screensaver-command', '-l'],
+        'shutdown': ['shutdown', 'now'],
+        'restart': ['reboot'],
+        'sleep': ['systemctl', 'suspend'],
+    }
+
+_SYSTEM_CONFIRMATIONS = {
+    'lock': "System locked.",
+    'shutdown': "System shutting down.",
+    'restart': "System restarting.",
+    'sleep': "System entering sleep mode.",
+}
+
+# Activated IAudioEndpointVolume interface, reused across volume commands on Windows
+_cached_volume_iface = None
+
+# Snapshot of running processes (timestamp, list) shared by back-to-back close requests
+_PROCESS_CACHE_TTL = 0.5
+_proc_cache = (0.0, [])
+
+# ALSA 'Master' mixer, reused across volume commands on Linux.
+# False once we know pyalsaaudio is unusable and amixer must be used instead.
+_alsa_mixer = None
+
+# --- Helper Functions for Cross-Platform Execution ---
+
+def _open_app_cross_platform(app_name):
+    """Opens an application based on the current OS."""
+    app_name = app_name.lower().replace(' ', '')
+    command = _APP_MAPPING.get(app_name, app_name) # Use mapped name or original
+    
+    try:
+        if _IS_WIN:
+            # ShellExecute resolves app aliases and URIs like 'start' does,
+            # without spawning cmd.exe first. Doesn't block the assistant.
+            os.startfile(command)
+        elif _IS_MAC:
+            # On macOS, use 'open'
+            subprocess.Popen(['open', '-a', command])
+        else:
+            # On Linux, run directly (assuming the command is in PATH)
+            subprocess.Popen([command])
+        return True
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        logger.error(f"App Open Error for {app_name}: {e}")
+        return False
+
+def _running_processes(psutil):
+    """Returns running processes, re-enumerating at most once per _PROCESS_CACHE_TTL."""
+    global _proc_cache
+    now = time.monotonic()
+    timestamp, processes = _proc_cache
+    if now - timestamp > _PROCESS_CACHE_TTL:
+        processes = list(psutil.process_iter(['name']))
+        _proc_cache = (now, processes)
+    return processes
+
+def _close_app_psutil(psutil, app_name):
+    """Terminates every process named app_name (extension ignored). Returns True if any were found."""
+    closed = False
+    for proc in _running_processes(psutil):
+        name = proc.info.get('name')
+        # Exact stem only, so "chrome" doesn't also hit chromedriver & co.
+        if name and os.path.splitext(name)[0].lower() == app_name:
+            try:
+                proc.terminate()
+                closed = True
+            except psutil.Error:
+                # Already exited since the snapshot, or not ours to terminate
+                pass
+    return closed
+
+def _close_app_cross_platform(app_name):
+    """Closes an application based on the current OS."""
+    app_name = app_name.lower().replace(' ', '')
+    if not app_name:
+        logger.warning("Refusing to close an application with an empty name.")
+        return False
+
+    # Prefer terminating by PID via psutil over spawning taskkill/osascript/pkill
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    try:
+        # Fall back to the OS commands when psutil finds no matching process
+        # (e.g. the app's process name differs from what the user said)
+        if psutil is not None and _close_app_psutil(psutil, app_name):
+            return True
+        if _IS_WIN:
+            # Taskkill is the standard way to terminate a process by name or window title
+            # /F forces termination, /IM specifies image name
+            subprocess.run(['taskkill', '/F', '/IM', f'{app_name}.exe'], check=True, stdout=_DEVNULL_FD, stderr=_DEVNULL_FD)
+            return True
+        elif _IS_MAC:
+            # On macOS, use osascript to tell the application to quit
+            subprocess.run(['osascript', '-e', f'quit app "{app_name}"'], check=True, stdout=_DEVNULL_FD, stderr=_DEVNULL_FD)
+            return True
+        else:
+            # On Linux, use pkill
+            subprocess.run(['pkill', '-f', app_name], check=True, stdout=_DEVNULL_FD, stderr=_DEVNULL_FD)
+            return True
+    except subprocess.CalledProcessError:
+        logger.warning(f"Failed to close or find app: {app_name}")
+        return False
+    except Exception as e:
+        logger.error(f"App Close Error for {app_name}: {e}")
+        return False
+
+def _system_control_cross_platform(command):
+    """Executes a system-level command (shutdown, lock, restart)."""
+    command = command.lower()
+    
+    if command not in _SYSTEM_COMMANDS:
+        return False
+
+    try:
+        args = _SYSTEM_COMMANDS[command]
+        if args is None:
+            speak("I need administrative rights or a specific utility to put the system to sleep.")
+            return False
+        subprocess.run(args, check=True, stdout=_DEVNULL_FD, stderr=_DEVNULL_FD)
+        speak(_SYSTEM_CONFIRMATIONS[command])
+        return True
+    except Exception as e:
+        logger.error(f"System Control Error: {e}")
+        speak(f"Could not execute system command: {command}")
+        return False
+
+def _volume_control_windows(operation, value):
+    """Handles volume control using pycaw on Windows."""
+    global _cached_volume_iface
+    # Imported here so startup doesn't pay for comtypes/pycaw loading
+    try:
+        from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+        from comtypes import CLSCTX_ALL
+        from ctypes import cast, POINTER
+    except ImportError:
+        logger.warning("pycaw not installed. Volume control on Windows disabled.")
+        return False
+
+    try:
+        if _cached_volume_iface is None:
+            devices = AudioUtilities.GetDefaultAudioEndpoint()
+            interface = devices.Activate(
+                IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+            _cached_volume_iface = cast(interface, POINTER(IAudioEndpointVolume))
+        volume = _cached_volume_iface
+        
+        current_volume_scalar = volume.GetMasterVolumeLevelScalar()
+        
+        if operation == 'set':
+            target_scalar = min(1.0, max(0.0, value / 100.0))
+            volume.SetMasterVolumeLevelScalar(target_scalar, None)
+            return True
+        elif operation == 'increase':
+            target_scalar = min(1.0, current_volume_scalar + (DEFAULT_VOLUME_STEP / 100.0))
+            volume.SetMasterVolumeLevelScalar(target_scalar, None)
+            return True
+        elif operation == 'decrease':
+            target_scalar = max(0.0, current_volume_scalar - (DEFAULT_VOLUME_STEP / 100.0))
+            volume.SetMasterVolumeLevelScalar(target_scalar, None)
+            return True
+        elif operation == 'mute':
+            volume.SetMute(1, None)
+            return True
+        elif operation == 'unmute':
+            volume.SetMute(0, None)
+            return True
+    except Exception as e:
+        # Drop the cached interface so the endpoint is re-activated next time
+        # (e.g. after the default audio device was switched)
+        _cached_volume_iface = None
+        logger.error(f"Windows Volume Control Error: {e}")
+        return False
+
+def _get_alsa_mixer():
+    """Returns the cached ALSA 'Master' mixer, or None if pyalsaaudio isn't usable."""
+    global _alsa_mixer
+    if _alsa_mixer is None:
+        try:
+            import alsaaudio
+            _alsa_mixer = alsaaudio.Mixer('Master')
+        except Exception as e:
+            logger.debug(f"pyalsaaudio unavailable, falling back to amixer: {e}")
+            _alsa_mixer = False
+    return _alsa_mixer or None
+
+def _volume_control_alsa(mixer, operation, value):
+    """Handles volume control directly through an ALSA mixer, without spawning amixer."""
+    if operation == 'set':
+        mixer.setvolume(min(100, max(0, int(value))))
+    elif operation in ('increase', 'decrease'):
+        mixer.handleevents()  # Pick up changes made outside the assistant
+        current = mixer.getvolume()[0]
+        step = DEFAULT_VOLUME_STEP if operation == 'increase' else -DEFAULT_VOLUME_STEP
+        mixer.setvolume(min(100, max(0, current + step)))
+    elif operation == 'mute':
+        mixer.setmute(1)
+    elif operation == 'unmute':
+        mixer.setmute(0)
+    else:
+        return False
+    return True
+
+def _volume_control_mac_linux(operation, value):
+    """Handles volume control using 'osascript' (Mac) or pyalsaaudio/'amixer' (Linux)."""
+    try:
+        if _IS_MAC:
+            if operation == 'set':
+                subprocess.run(['osascript', '-e', f'set volume output volume {value}'], check=True, stdout=_DEVNULL_FD)
+            elif operation == 'increase':
+                subprocess.run(['osascript', '-e', f'set volume output volume ((output volume of (get volume settings)) + {DEFAULT_VOLUME_STEP})'], check=True, stdout=_DEVNULL_FD)
+            elif operation == 'decrease':
+                subprocess.run(['osascript', '-e', f'set volume output volume ((output volume of (get volume settings)) - {DEFAULT_VOLUME_STEP})'], check=True, stdout=_DEVNULL_FD)
+            elif operation == 'mute':
+                subprocess.run(['osascript', '-e', 'set volume with output muted'], check=True, stdout=_DEVNULL_FD)
+            elif operation == 'unmute':
+                subprocess.run(['osascript', '-e', 'set volume without output muted'], check=True, stdout=_DEVNULL_FD)
+            else:
+                return False
+            return True
+        elif _IS_LINUX:
+            mixer = _get_alsa_mixer()
+            if mixer:
+                return _volume_control_alsa(mixer, operation, value)
+            if operation == 'set':
+                subprocess.run(['amixer', 'set', 'Master', f'{value}%'], check=True, stdout=_DEVNULL_FD)
+            elif operation == 'increase':
+                subprocess.run(['amixer', 'set', 'Master', f'{DEFAULT_VOLUME_STEP}%+'], check=True, stdout=_DEVNULL_FD)
+            elif operation == 'decrease':
+                subprocess.run(['amixer', 'set', 'Master', f'{DEFAULT_VOLUME_STEP}%-'], check=True, stdout=_DEVNULL_FD)
+            elif operation == 'mute':
+                subprocess.run(['amixer', 'set', 'Master', 'mute'], check=True, stdout=_DEVNULL_FD)
+            elif operation == 'unmute':
+                subprocess.run(['amixer', 'set', 'Master', 'unmute'], check=True, stdout=_DEVNULL_FD)
+            else:
+                return False
+            return True
+        else:
+            return False
+    except Exception as e:
+        logger.error(f"Mac/Linux Volume Control Error: {e}")
+        return False
+
+
+# --- Action Handler Functions ---
+
+def handle_open_application(params, original_command=None):
+    """Handles the 'open_application' action."""
+    app_name = params.get('app_name')
+    if app_name:
+        speak(f"Launching {app_name}.")
+        if not _open_app_cross_platform(app_name):
+            speak(f"Sorry, I couldn't find the application: {app_name}.")
+    else:
+        speak("I need an application name to open.")
+
+def handle_close_application(params, original_command=None):
+    """Handles the 'close_application' action."""
+    app_name = params.get('app_name')
+    if app_name:
+        speak(f"Attempting to close {app_name}.")
+        if not _close_app_cross_platform(app_name):
+            speak(f"Sorry, I couldn't close the application or it wasn't running: {app_name}.")
+        else:
+            speak(f"{app_name} closed successfully.")
+    else:
+        speak("I need an application name to close.")
+
+def handle_system_control(params, original_command=None):
+    """Handles the 'system_control' action."""
+    command = params.get('command')
+    if command:
+        if not _system_control_cross_platform(command):
+            speak(f"Sorry, the system control command '{command}' failed.")
+    else:
+        speak("I need a command like shutdown, restart, or lock.")
+
+def handle_volume_control(params, original_command=None):
+    """Handles the 'volume_control' action."""
+    operation = params.get('operation')
+    value = params.get('value')
+    
+    if _IS_WIN:
+        success = _volume_control_windows(operation, value)
+    else:
+        success = _volume_control_mac_linux(operation, value)
+
+    if success:
+        if operation == 'set':
+            speak(f"Volume set to {value} percent.")
+        elif operation == 'increase' or operation == 'decrease':
+            speak(f"Volume {operation}d by {DEFAULT_VOLUME_STEP} percent.")
+        elif operation == 'mute' or operation == 'unmute':
+            speak(f"Volume {operation}d.")
+        else:
+            speak("Volume control executed.")
+    else:
+        speak("I'm sorry, I couldn't control the system volume. Check your pycaw installation on Windows, or permissions on other operating systems.")
+
+
+def handle_window_control(params, original_command=None):
+    """Handles commands to minimize or maximize the active window using pyautogui."""
+    command = params.get('command')
+    
+    try:
+        import pyautogui
+
+        if command == 'minimize':
+            if _IS_WIN:
+                pyautogui.hotkey('win', 'down')
+            elif _IS_MAC:
+                pyautogui.hotkey('command', 'm')
+            else: # Linux/General
+                pyautogui.hotkey('alt', 'f9') # Common minimize shortcut
+            speak("Window minimized.")
+        
+        elif command == 'maximize':
+            if _IS_WIN:
+                pyautogui.hotkey('win', 'up')
+            elif _IS_MAC:
+                # Note: No single, reliable universal Mac maximize shortcut via hotkey.
+                speak("Attempting to maximize window.")
+                pyautogui.hotkey('win', 'up') # Using an attempt
+            else: # Linux/General
+                pyautogui.hotkey('alt', 'f10') # Common maximize shortcut
+            speak("Window maximized.")
+            
+        else:
+            speak(f"Unknown window control command: {command}")
+            
+    except Exception as e:
+        logger.error(f"Window Control Error: {e}")
+        speak("I had trouble controlling the window. Check your system's keyboard shortcuts.")
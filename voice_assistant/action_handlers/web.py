@@ -0,0 +1,46 @@
+# voice_assistant/action_handlers/web.py
+# Opening websites and web searches
+
+import webbrowser
+from urllib.parse import quote_plus
+
+try:
+    from ..config import DEFAULT_WEB_ENGINE
+    from ..voice_io import speak
+except ImportError:
+    from config import DEFAULT_WEB_ENGINE
+    from voice_io import speak
+
+# Search URL templates for 'web_search', filled with the encoded query
+_SEARCH_URLS = {
+    "google": "https://www.google.com/search?q={}",
+    "duckduckgo": "https://duckduckgo.com/?q={}",
+    "bing": "https://www.bing.com/search?q={}"
+}
+
+def handle_open_website(params, original_command=None):
+    """Handles the 'open_website' action."""
+    url = params.get('url')
+    if url:
+        # Ensure URL has a scheme for correct opening
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url.lstrip('www.')
+        speak(f"Opening {url}")
+        webbrowser.open(url)
+    else:
+        speak("I need a website address to open.")
+
+def handle_web_search(params, original_command=None):
+    """Handles the 'web_search' action."""
+    query = params.get('query')
+    engine = params.get('engine', DEFAULT_WEB_ENGINE)
+    
+    if query:
+        # Only the chosen engine's URL is built, so the query is encoded once
+        url_template = _SEARCH_URLS.get(engine.lower(), _SEARCH_URLS[DEFAULT_WEB_ENGINE])
+        url = url_template.format(quote_plus(query))
+        
+        speak(f"Searching {engine.capitalize()} for: {query}")
+        webbrowser.open(url)
+    else:
+        speak("I need a query for a web search.")
@@ -9,6 +9,11 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")  # Get API key from environment var
 # Voice Assistant Settings
 WAKE_WORD = "assistant"  # Activation keyword
 
+# Offline wake-word and yes/no recognition with Vosk (optional). Download a small
+# model from https://alphacephei.com/vosk/models and point this at its folder; if
+# vosk or the model is missing, both are recognized with Google instead.
+VOSK_MODEL_PATH = os.getenv("ALPHA_VOSK_MODEL", "models/vosk-model-small-en-us-0.15")
+
 # The prompt for the assistant to listen for a command after the wake word.
 LISTENING_PROMPT = "How can I help you?"
 
@@ -23,6 +28,12 @@ DEFAULT_WEB_ENGINE = "google"
 # Default volume change percentage for 'increase'/'decrease' operations.
 DEFAULT_VOLUME_STEP = 10
 
+# --- Startup ---
+# Heavy optional modules (e.g. pyautogui) are imported on first use. Set
+# ALPHA_EAGER_IMPORT=1 to import them at startup instead, so CI catches
+# broken deferred imports.
+EAGER_IMPORTS = os.getenv("ALPHA_EAGER_IMPORT") == "1"
+
 # --- File Paths ---
 # Log file location
 LOG_FILE = "voice_assistant.log"
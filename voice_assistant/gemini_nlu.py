@@ -3,8 +3,21 @@
 
 from google import genai
 from google.genai import types
+import httpx
+import copy
+import importlib.util
 import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+try:
+    # Faster parsing of NLU replies when available
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 try:
     from .config import GEMINI_API_KEY
 except ImportError:
@@ -86,56 +99,324 @@ Output:
 { "action": "file_io", "parameters": { "operation": "delete", "file_name": "temporary file.txt" }, "confidence": 0.97 }
 """
 
-def parse_command_with_gemini(command_text: str) -> dict:
+# JSON schema Gemini's replies are constrained to (mirrors the action list above)
+NLU_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "action": {
+            "type": "STRING",
+            "enum": [
+                "gemini_reply", "open_website", "open_application", "close_application",
+                "youtube_search", "youtube_play", "web_search", "system_control",
+                "volume_control", "file_io", "window_control", "unknown"
+            ]
+        },
+        "parameters": {
+            "type": "OBJECT",
+            "properties": {
+                "answer": {"type": "STRING"},
+                "url": {"type": "STRING"},
+                "app_name": {"type": "STRING"},
+                "query": {"type": "STRING"},
+                "song_name": {"type": "STRING"},
+                "artist": {"type": "STRING", "nullable": True},
+                "engine": {"type": "STRING"},
+                "command": {"type": "STRING"},
+                "operation": {"type": "STRING"},
+                "value": {"type": "NUMBER", "nullable": True},
+                "file_name": {"type": "STRING"},
+                "content": {"type": "STRING", "nullable": True},
+                "reason": {"type": "STRING"},
+                "original_command": {"type": "STRING"}
+            }
+        },
+        "confidence": {"type": "NUMBER"}
+    },
+    "required": ["action", "parameters", "confidence"]
+}
+
+# Gemini client and request config, created on first use and then reused so
+# every command shares one connection pool instead of reconnecting
+_CLIENT = None
+_CONFIG = None
+_CLIENT_LOCK = threading.Lock()
+
+def _http_options() -> types.HttpOptions:
     """
-    Sends the user command to the Gemini API for NLU processing.
-    The response is forced into a JSON structure defined by the NLU_SYSTEM_INSTRUCTIONS.
+    Transport settings for the Gemini client: one small keep-alive pool that
+    holds warm TLS connections for 10 minutes between commands, HTTP/2 when
+    the 'h2' package is installed, and a 15 s request timeout.
+    """
+    limits = httpx.Limits(max_connections=4, max_keepalive_connections=4, keepalive_expiry=600)
+    http2 = importlib.util.find_spec("h2") is not None
+    return types.HttpOptions(
+        # The SDK passes this timeout (in ms) on every request, overriding any
+        # timeout set on the httpx client itself
+        timeout=15_000,
+        client_args={"transport": httpx.HTTPTransport(http2=http2, limits=limits)},
+        async_client_args={"transport": httpx.AsyncHTTPTransport(http2=http2, limits=limits)},
+    )
+
+def _get_client():
+    """Returns the shared Gemini client and request config, creating them on first call."""
+    global _CLIENT, _CONFIG
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CONFIG = types.GenerateContentConfig(
+                system_instruction=NLU_SYSTEM_INSTRUCTIONS,
+                # Structured output: the server guarantees bare JSON in this shape
+                response_mime_type="application/json",
+                response_schema=NLU_RESPONSE_SCHEMA
+            )
+            _CLIENT = genai.Client(api_key=GEMINI_API_KEY, http_options=_http_options())
+        return _CLIENT, _CONFIG
+
+class LRUCache:
+    """A small least-recently-used cache whose entries expire after ttl seconds."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def get(self, key):
+        """Returns the cached value for key, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Parsed NLU results keyed by normalized command text. Voice commands repeat a
+# lot, and a hit skips the Gemini round-trip entirely.
+_NLU_CACHE = LRUCache(maxsize=256, ttl=3600.0)
+
+# Results that must not be replayed from cache: 'unknown' may be a transient
+# error, and 'gemini_reply' answers can go stale (e.g. "what time is it").
+_UNCACHEABLE_ACTIONS = frozenset({"unknown", "gemini_reply"})
+
+# Matches a complete "action" field in a partially received JSON reply
+_PARTIAL_ACTION_RE = re.compile(r'"action"\s*:\s*"([a-z_]+)"')
+# Streamed 'answer' string so far (complete escapes only) and sentence ends in it
+_PARTIAL_ANSWER_RE = re.compile(r'"answer"\s*:\s*"((?:[^"\\]|\\.)*)')
+_SENTENCE_END_RE = re.compile(r'[.!?]\s')
+
+def _normalize_command(command_text: str) -> str:
+    """Normalizes command text for use as a cache key."""
+    return " ".join(command_text.lower().split())
+
+# --- Fast Path ---
+# Rigid, common commands are answered locally in the same JSON shape Gemini
+# uses, skipping the API round-trip. Patterns match the whole normalized command.
+_SITE_URLS = {
+    "youtube": "https://www.youtube.com",
+    "gmail": "https://mail.google.com",
+    "github": "https://github.com",
+    "facebook": "https://www.facebook.com",
+    "google": "https://www.google.com",
+}
+
+def _fast_result(action: str, **parameters) -> dict:
+    return {"action": action, "parameters": parameters, "confidence": 0.99}
+
+_FAST_PATTERNS = [
+    (re.compile(r"^(?:open|go to) (youtube|gmail|github|facebook|google)(?:\.com)?$"),
+     lambda m: _fast_result("open_website", url=_SITE_URLS[m.group(1)])),
+    (re.compile(r"^(?:increase (?:the )?volume|(?:turn )?(?:the )?volume up|turn up the volume)$"),
+     lambda m: _fast_result("volume_control", operation="increase")),
+    (re.compile(r"^(?:decrease (?:the )?volume|(?:turn )?(?:the )?volume down|turn down the volume)$"),
+     lambda m: _fast_result("volume_control", operation="decrease")),
+    (re.compile(r"^set (?:the )?volume to (\d{1,3})(?: percent|%)?$"),
+     lambda m: _fast_result("volume_control", operation="set", value=min(100, int(m.group(1))))),
+    (re.compile(r"^(mute|unmute)(?: (?:the )?(?:volume|sound|audio))?$"),
+     lambda m: _fast_result("volume_control", operation=m.group(1))),
+    (re.compile(r"^lock (?:the |my )?(?:computer|screen|system|pc)$"),
+     lambda m: _fast_result("system_control", command="lock")),
+    (re.compile(r"^(minimize|maximize) (?:the |this )?window$"),
+     lambda m: _fast_result("window_control", command=m.group(1))),
+]
+
+def _match_fast_path(normalized_command: str):
+    """Returns an NLU result for a rigid command template, or None to ask Gemini."""
+    text = normalized_command.rstrip(".!?")
+    for pattern, build in _FAST_PATTERNS:
+        match = pattern.match(text)
+        if match:
+            return build(match)
+    return None
+
+def _prepare_request(command_text: str):
+    """
+    Handles everything that can answer a command without calling Gemini.
+    Returns (cache_key, result); result is None when the API must be called.
     """
+    cache_key = _normalize_command(command_text)
+    fast_result = _match_fast_path(cache_key)
+    if fast_result is not None:
+        logger.debug(f"NLU fast path matched: '{cache_key}'")
+        return cache_key, fast_result
+
     if not GEMINI_API_KEY:
         logger.error("Gemini API key is missing. Cannot perform NLU.")
         # Ensure we return a dictionary with the expected structure
-        return {"action": "unknown", "parameters": {"reason": "API Key Missing", "original_command": command_text}}
+        return cache_key, {"action": "unknown", "parameters": {"reason": "API Key Missing", "original_command": command_text}}
 
-    try:
-        # Initialize the client with the API key
-        client = genai.Client(api_key=GEMINI_API_KEY)
+    cached = _NLU_CACHE.get(cache_key)
+    if cached is not None:
+        logger.debug(f"NLU cache hit for: '{cache_key}'")
+        # Hand out a copy so callers can't mutate the cached result
+        return cache_key, copy.deepcopy(cached)
+    return cache_key, None
 
-        # Configure the request to use the system instructions
-        config = types.GenerateContentConfig(
-            system_instruction=NLU_SYSTEM_INSTRUCTIONS
-        )
+def _process_response(response_text: str, command_text: str, cache_key: str, parsed=None) -> dict:
+    """
+    Turns Gemini's JSON reply into the NLU result dict and caches it when allowed.
+    Uses the SDK's pre-parsed object when available, else parses response_text.
+    """
+    logger.debug(f"Gemini Raw JSON Response: {response_text}")
+
+    if isinstance(parsed, dict):
+        nlu_result = parsed
+    else:
+        # JSON mode means the text is bare JSON, no code fences to strip
+        nlu_result = _json_loads(response_text)
+    
+    # Safety check for 'unknown' action parameters
+    if nlu_result.get('action') == 'unknown' and 'original_command' not in nlu_result.get('parameters', {}):
+        nlu_result['parameters']['original_command'] = command_text
+
+    if nlu_result.get('action') not in _UNCACHEABLE_ACTIONS:
+        _NLU_CACHE.put(cache_key, copy.deepcopy(nlu_result))
+    
+    return nlu_result
+
+def _error_result(error: Exception, command_text: str, received_text: str = None) -> dict:
+    """Logs an NLU failure and converts it into an 'unknown' action."""
+    if isinstance(error, genai.errors.APIError):
+        logger.error(f"Gemini API Error: {error}")
+        return {"action": "unknown", "parameters": {"reason": f"Gemini API Error: {str(error)}", "original_command": command_text}}
+    if isinstance(error, json.JSONDecodeError):
+        logger.error(f"Failed to decode JSON from Gemini: {error}")
+        logger.error(f"Received text: {received_text if received_text is not None else 'N/A'}")
+        return {"action": "unknown", "parameters": {"reason": "JSON Parsing Failed from NLU Engine", "original_command": command_text}}
+    logger.error(f"An unexpected error occurred during API call: {error}")
+    return {"action": "unknown", "parameters": {"reason": f"Internal NLU Error: {str(error)}", "original_command": command_text}}
+
+def _build_contents(command_text: str, alternatives: Optional[list] = None) -> list:
+    """
+    Builds the request contents. When speech recognition produced several
+    hypotheses they all go into one request, and Gemini picks the most
+    plausible one instead of being called once per guess.
+    """
+    if not alternatives or len(alternatives) < 2:
+        return [command_text]
+    listed = "\n".join(f"{i}. {text}" for i, text in enumerate(alternatives, 1))
+    return [
+        "The speech recognizer produced these candidate transcriptions of one "
+        "spoken command, most likely first:\n"
+        f"{listed}\n"
+        "Pick the most plausible candidate and return a single JSON object for it."
+    ]
+
+def parse_command_with_gemini(command_text: str, alternatives: Optional[list] = None) -> dict:
+    """
+    Sends the user command to the Gemini API for NLU processing.
+    The response is forced into a JSON structure defined by the NLU_SYSTEM_INSTRUCTIONS.
+    alternatives optionally lists further STT hypotheses (command_text first)
+    to resolve in the same request; cache and fast path use command_text.
+    """
+    cache_key, result = _prepare_request(command_text)
+    if result is not None:
+        return result
+
+    response_text = None
+    try:
+        # Reuse the client and system-instruction config across commands
+        client, config = _get_client()
         
         # Call the API
         response = client.models.generate_content(
             model='gemini-2.5-flash',
-            contents=[command_text],
+            contents=_build_contents(command_text, alternatives),
             config=config
         )
-        
-        # The response.text should be a clean JSON string
-        json_string = response.text.strip()
-        logger.debug(f"Gemini Raw JSON Response: {json_string}")
-        
-        # Parse the JSON string into a Python dictionary
-        nlu_result = json.loads(json_string)
-        
-        # Safety check for 'unknown' action parameters
-        if nlu_result.get('action') == 'unknown' and 'original_command' not in nlu_result.get('parameters', {}):
-            nlu_result['parameters']['original_command'] = command_text
-        
+        response_text = response.text
+        return _process_response(response_text, command_text, cache_key, response.parsed)
+    except Exception as e:
+        return _error_result(e, command_text, response_text)
+
+def _partial_answer(response_text: str) -> Optional[str]:
+    """Decodes as much of a streamed gemini_reply 'answer' as has arrived, or None."""
+    match = _PARTIAL_ANSWER_RE.search(response_text)
+    if not match:
+        return None
+    try:
+        return _json_loads(f'"{match.group(1)}"')
+    except ValueError:
+        # Cut off inside a \uXXXX escape; the next chunk completes it
+        return None
+
+async def parse_command_with_gemini_async(command_text: str,
+                                         on_action: Optional[Callable[[str], None]] = None,
+                                         alternatives: Optional[list] = None,
+                                         on_answer_sentence: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Async version of parse_command_with_gemini. The reply is streamed, and
+    on_action (if given) is called with the action type as soon as it appears
+    in the partial JSON, so the caller can prepare the handler before the
+    parameters have arrived. The full reply is still parsed strictly at the end.
+
+    For gemini_reply answers, on_answer_sentence (if given) receives each
+    completed sentence as it streams in. The number of answer characters
+    handed out that way is stored in parameters['answer_spoken_chars'].
+    """
+    cache_key, result = _prepare_request(command_text)
+    if result is not None:
+        if on_action:
+            on_action(result.get('action'))
+        return result
+
+    chunks = []
+    action = None
+    spoken = 0
+    try:
+        client, config = _get_client()
+        stream = await client.aio.models.generate_content_stream(
+            model='gemini-2.5-flash',
+            contents=_build_contents(command_text, alternatives),
+            config=config
+        )
+        async for chunk in stream:
+            if chunk.text:
+                chunks.append(chunk.text)
+            if action is None and (on_action or on_answer_sentence):
+                match = _PARTIAL_ACTION_RE.search("".join(chunks))
+                if match:
+                    action = match.group(1)
+                    if on_action:
+                        on_action(action)
+            if on_answer_sentence and action == "gemini_reply":
+                answer = _partial_answer("".join(chunks))
+                for match in _SENTENCE_END_RE.finditer(answer or "", spoken):
+                    on_answer_sentence(answer[spoken:match.end()].strip())
+                    spoken = match.end()
+        nlu_result = _process_response("".join(chunks), command_text, cache_key)
+        if spoken:
+            nlu_result.setdefault('parameters', {})['answer_spoken_chars'] = spoken
         return nlu_result
-        
-    except genai.errors.APIError as e:
-        logger.error(f"Gemini API Error: {e}")
-        return {"action": "unknown", "parameters": {"reason": f"Gemini API Error: {str(e)}", "original_command": command_text}}
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to decode JSON from Gemini: {e}")
-        try:
-             received_text = response.text if 'response' in locals() else 'N/A'
-             logger.error(f"Received text: {received_text}")
-        except NameError:
-             logger.error("Received text: N/A (API call failed early)")
-        return {"action": "unknown", "parameters": {"reason": "JSON Parsing Failed from NLU Engine", "original_command": command_text}}
     except Exception as e:
-        logger.error(f"An unexpected error occurred during API call: {e}")
-        return {"action": "unknown", "parameters": {"reason": f"Internal NLU Error: {str(e)}", "original_command": command_text}}
\ No newline at end of file
+        return _error_result(e, command_text, "".join(chunks))
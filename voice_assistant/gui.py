@@ -5,6 +5,7 @@ via a queue. No external dependencies required.
 """
 from __future__ import annotations
 
+import math
 import threading
 import queue
 import time
@@ -44,6 +45,40 @@ _TEXT = _THEME.get("text", "#a7f0ff")
 _TITLE = _THEME.get("title", _ACCENT)
 _FONT = _THEME.get("font", "Segoe UI")
 
+# HUD animation runs at 10 FPS; the decorative bars don't need more, and
+# every frame costs 40 Tk calls. The phase step keeps the pulse speed the
+# same as the original 60 ms / 0.12 rad-per-frame animation.
+_FRAME_MS = 100
+_PHASE_STEP = 0.12 * _FRAME_MS / 60
+
+# Upper bound on log lines inserted per queue drain, so a burst of logging
+# can't stall the UI thread; the remainder is picked up on the next drain
+_MAX_LOGS_PER_DRAIN = 32
+
+# Number of precomputed steps in the accent -> accent_alt color ramp
+_BLEND_STEPS = 64
+
+
+def _build_blend_table() -> list:
+    """Precomputes the bar colors blended between _ACCENT and _ACCENT_ALT."""
+    ts = [i / (_BLEND_STEPS - 1) for i in range(_BLEND_STEPS)]
+    try:
+        a_r, a_g, a_b = (int(_ACCENT.lstrip('#')[j:j + 2], 16) for j in (0, 2, 4))
+        b_r, b_g, b_b = (int(_ACCENT_ALT.lstrip('#')[j:j + 2], 16) for j in (0, 2, 4))
+    except ValueError:
+        # Theme colors aren't #rrggbb; fall back to a plain cyan intensity ramp
+        return [f"#{int(40 + t * 160):02x}{200:02x}{220:02x}" for t in ts]
+    return [
+        f"#{int(a_r * (1 - t) + b_r * t):02x}"
+        f"{int(a_g * (1 - t) + b_g * t):02x}"
+        f"{int(a_b * (1 - t) + b_b * t):02x}"
+        for t in ts
+    ]
+
+
+_BLEND = _build_blend_table()
+_sin = math.sin
+
 
 class AlphaGUI:
     def __init__(self, on_quit: Optional[Callable[[], None]] = None) -> None:
@@ -51,6 +86,9 @@ class AlphaGUI:
         self._q: "queue.Queue[tuple[str, object]]" = queue.Queue()
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._started = False
+        # Log timestamp formatted for the current second, reused within it
+        self._last_ts_sec = None
+        self._last_ts_str = ""
 
     def start(self) -> None:
         if not self._started:
@@ -82,7 +120,7 @@ class AlphaGUI:
         for i in range(20):
             x0 = 10 + i * 33
             rect = self.canvas.create_rectangle(x0, 60, x0 + 20, 100, fill=_ACCENT, outline="")
-            self._bars.append(rect)
+            self._bars.append((rect, x0, x0 + 20))
 
         # Scrolled text area for transcripts
         self.log = scrolledtext.ScrolledText(self.root, height=8, bg=_CANVAS_BG, fg=_TEXT,
@@ -131,65 +169,67 @@ class AlphaGUI:
 
     def _tick(self) -> None:
         # Animate bars with a pulsing effect dependent on a phase variable
-        import math
-        self._anim_phase += 0.12
-        for i, rect in enumerate(self._bars):
-            height = 20 + (math.sin(self._anim_phase + i * 0.35) + 1) * 35
-            x0, y0, x1, y1 = self.canvas.coords(rect)
-            self.canvas.coords(rect, x0, 100 - height, x1, 100)
-            # color ramp
-            intensity = int(40 + (math.sin(self._anim_phase + i * 0.35) + 1) * 80)
+        self._anim_phase += _PHASE_STEP
+        phase = self._anim_phase
+        sin = _sin
+        coords = self.canvas.coords
+        itemconfig = self.canvas.itemconfig
+        blend = _BLEND
+        last_step = _BLEND_STEPS - 1
+        for i, (rect, x0, x1) in enumerate(self._bars):
+            # 0..1 pulse shared by the bar height and its color
+            t = (sin(phase + i * 0.35) + 1) / 2.0
+            height = 20 + t * 70
+            coords(rect, x0, 100 - height, x1, 100)
             # blend between accent and accent_alt for dynamic color
             try:
-                # simple blend by interpolation on hex channels
-                a_r = int(_ACCENT.lstrip('#')[0:2], 16)
-                a_g = int(_ACCENT.lstrip('#')[2:4], 16)
-                a_b = int(_ACCENT.lstrip('#')[4:6], 16)
-                b_r = int(_ACCENT_ALT.lstrip('#')[0:2], 16)
-                b_g = int(_ACCENT_ALT.lstrip('#')[2:4], 16)
-                b_b = int(_ACCENT_ALT.lstrip('#')[4:6], 16)
-                t = (math.sin(self._anim_phase + i * 0.35) + 1) / 2.0
-                r = int(a_r * (1 - t) + b_r * t)
-                g = int(a_g * (1 - t) + b_g * t)
-                b = int(a_b * (1 - t) + b_b * t)
-                color = f"#{r:02x}{g:02x}{b:02x}"
-            except Exception:
-                color = f"#{intensity:02x}{200:02x}{220:02x}"
-            try:
-                self.canvas.itemconfig(rect, fill=color)
+                itemconfig(rect, fill=blend[int(t * last_step)])
             except Exception:
                 pass
 
         # schedule next frame
-        self.root.after(60, self._tick)
+        self.root.after(_FRAME_MS, self._tick)
 
     def _process_queue(self) -> None:
-        # Drain queue and apply updates to UI
+        # Drain queue and apply updates to UI. Status changes are coalesced so
+        # only the latest one is shown, and log lines are inserted as one batch.
+        latest_status = None
+        logs = []
         try:
-            while True:
+            while len(logs) < _MAX_LOGS_PER_DRAIN:
                 kind, payload = self._q.get_nowait()
                 if kind == "status":
-                    self.status_var.set(payload)
+                    latest_status = payload
                 elif kind == "log":
-                    self._append_log(payload)
+                    logs.append(payload)
                 elif kind == "listening":
                     if payload:
-                        self.status_var.set("Status: Listening... (wake word detected)")
+                        latest_status = "Status: Listening... (wake word detected)"
                     else:
-                        self.status_var.set("Status: Idle")
+                        latest_status = "Status: Idle"
         except queue.Empty:
             pass
 
+        if latest_status is not None:
+            self.status_var.set(latest_status)
+        if logs:
+            self._append_logs(logs)
+
         # schedule next check
         self.root.after(150, self._process_queue)
 
-    def _append_log(self, text: str) -> None:
+    def _append_logs(self, lines: list) -> None:
         try:
+            now = int(time.time())
+            if now != self._last_ts_sec:
+                self._last_ts_sec = now
+                self._last_ts_str = time.strftime("%H:%M:%S", time.localtime(now))
+            timestamp = self._last_ts_str
+            # One state toggle per drain, around the single batched insert
             self.log.configure(state=tk.NORMAL)
-            timestamp = time.strftime("%H:%M:%S")
-            self.log.insert(tk.END, f"[{timestamp}] {text}\n")
-            self.log.see(tk.END)
+            self.log.insert(tk.END, "".join(f"[{timestamp}] {text}\n" for text in lines))
             self.log.configure(state=tk.DISABLED)
+            self.log.see(tk.END)
         except Exception:
             pass
 
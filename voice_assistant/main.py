@@ -1,28 +1,33 @@
 # Main module for Alpha Voice Assistant
 # Orchestrates voice recognition, NLU processing, and command execution
 
+import asyncio
 import logging
-import time
-from typing import Optional
+import threading
+from typing import List, Optional
 
 try:
     from .config import LOG_FILE, WAKE_WORD, LISTENING_PROMPT, GEMINI_API_KEY
-    from .voice_io import initialize_tts, listen_for_wake_word, listen_for_command, speak
-    from .gemini_nlu import parse_command_with_gemini
-    from .action_handlers import execute_action
+    from .voice_io import initialize_tts, listen_for_wake_word, listen_for_command_alternatives, speak, speak_blocking
+    from .gemini_nlu import parse_command_with_gemini_async
+    from .action_handlers import execute_action, prefetch_handler
     from .gui import AlphaGUI
 except ImportError:
     from config import LOG_FILE, WAKE_WORD, LISTENING_PROMPT, GEMINI_API_KEY
-    from voice_io import initialize_tts, listen_for_wake_word, listen_for_command, speak
-    from gemini_nlu import parse_command_with_gemini
-    from action_handlers import execute_action
+    from voice_io import initialize_tts, listen_for_wake_word, listen_for_command_alternatives, speak, speak_blocking
+    from gemini_nlu import parse_command_with_gemini_async
+    from action_handlers import execute_action, prefetch_handler
     from gui import AlphaGUI
 
-STOP_REQUESTED = False  # Control flag for graceful shutdown
+# Set by the GUI's quit button (from the GUI thread) for graceful shutdown
+stop_event = threading.Event()
+_request_stop = stop_event.set
 
-def _request_stop() -> None:
-    global STOP_REQUESTED
-    STOP_REQUESTED = True
+# Upper bound on prompted follow-up turns per wake session
+MAX_FOLLOWUPS = 3
+# Seconds to wait for Gemini to name the action before giving up on the
+# command. A streamed answer that is already being spoken isn't cut off.
+NLU_TIMEOUT = 8.0
 
 # --- Logging Setup ---
 logging.basicConfig(
@@ -36,6 +41,121 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def _parse_command(alternatives: List[str], gui: Optional[AlphaGUI]) -> dict:
+    """
+    Runs Gemini NLU on the STT hypotheses (most likely first) while animating a
+    processing status in the GUI. The action's handler is imported as soon as
+    the streamed reply names it, and a spoken answer starts playing from its
+    first complete sentence.
+    """
+    action_seen = asyncio.Event()
+
+    def on_action(action_type):
+        action_seen.set()
+        prefetch_handler(action_type)
+
+    nlu_task = asyncio.ensure_future(
+        parse_command_with_gemini_async(alternatives[0], on_action=on_action,
+                                        alternatives=alternatives, on_answer_sentence=speak))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + NLU_TIMEOUT
+    dots = 0
+    while not nlu_task.done():
+        if gui:
+            gui.update_status("Status: Processing" + "." * (dots % 3 + 1))
+            dots += 1
+        # The timeout only covers waiting for the reply to start; once the
+        # action is known the stream is alive and may run on while it's spoken
+        if not action_seen.is_set():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                nlu_task.cancel()
+                raise asyncio.TimeoutError()
+            await asyncio.wait({nlu_task}, timeout=min(0.4, remaining))
+        else:
+            await asyncio.wait({nlu_task}, timeout=0.4)
+    return nlu_task.result()
+
+def _listen_for_followup(max_attempts: int = 2) -> List[str]:
+    """
+    Listens for a follow-up answer, giving up after consecutive empty recognitions.
+    Misses are not announced individually; a single re-prompt precedes each
+    retry and the caller announces the final give-up.
+    """
+    empty_streak = 0
+    while empty_streak < max_attempts:
+        if empty_streak:
+            speak("I didn't catch that. Please say it again.")
+        alternatives = listen_for_command_alternatives(quiet=True)
+        if alternatives:
+            return alternatives
+        empty_streak += 1
+    return []
+
+async def _assistant_loop(gui: Optional[AlphaGUI]) -> None:
+    """
+    Wake word -> command -> NLU -> action loop.
+    Audio and action calls stay on this thread (the SAPI voice belongs to it);
+    only the Gemini request is awaited, so the GUI keeps updating meanwhile.
+    """
+    # Each pass blocks in the microphone, so no extra sleep is needed between them
+    while not stop_event.is_set():
+        if listen_for_wake_word():
+            # Assistant is awake. The prompt plays in the background while
+            # the GUI updates; the command listen waits for it to finish.
+            speak(LISTENING_PROMPT)
+            if gui:
+                gui.set_listening(True)
+                gui.update_status("Status: Wake word detected — Listening for command")
+                gui.log_text("Wake word detected.")
+            
+            # 3. Listen for Initial Command
+            alternatives = listen_for_command_alternatives()
+            
+            if alternatives:
+                command_text = alternatives[0]
+                if gui:
+                    gui.log_text(f"User command: {command_text}")
+                # Follow-up commands/conversational turns, bounded so a handler
+                # that keeps asking for more input can't loop on API calls forever
+                for turn in range(1 + MAX_FOLLOWUPS):
+                    # 4. Process Command with Gemini NLU
+                    try:
+                        nlu_result = await _parse_command(alternatives, gui)
+                    except asyncio.TimeoutError:
+                        logger.warning(f"Gemini NLU timed out after {NLU_TIMEOUT}s for: '{command_text}'")
+                        speak("Sorry, that took too long. Please try again.")
+                        break
+                    
+                    # 5. Execute Action
+                    # execute_action now returns True if a follow-up listen is needed
+                    should_relisten = execute_action(nlu_result, command_text)
+                    
+                    if not should_relisten:
+                        # Action complete (or failed but required no follow-up), exit inner loop
+                        break
+                    if turn == MAX_FOLLOWUPS:
+                        logger.warning(f"Reached {MAX_FOLLOWUPS} follow-ups; returning to wake word mode.")
+                        speak("Returning to wake word detection.")
+                        break
+
+                    # 6. Listen for Follow-up Command
+                    print("System prompted user. Listening for follow-up...")
+                    if gui:
+                        gui.log_text(f"Prompted follow-up: {command_text}")
+                    alternatives = _listen_for_followup()
+                    if not alternatives:
+                        # User didn't respond to the prompt, break out to wake word mode
+                        speak("No response heard. Returning to wake word detection.")
+                        break
+                    command_text = alternatives[0]
+
+            if gui:
+                gui.set_listening(False)
+                gui.update_status("Status: Idle")
+
+    logger.info("Stop requested by GUI. Shutting down main loop.")
+
 def main():
     """Main function to run the voice assistant application loop."""
     print("👋 Alpha Voice Assistant Starting Up...")
@@ -69,62 +189,20 @@ def main():
 
     try:
         # 2. Main Listening Loop
-        while True:
-            # Allow GUI to request stop
-            if STOP_REQUESTED:
-                logger.info("Stop requested by GUI. Shutting down main loop.")
-                break
-
-            if listen_for_wake_word():
-                # Assistant is awake
-                if gui:
-                    gui.set_listening(True)
-                    gui.update_status("Status: Wake word detected — Listening for command")
-                    gui.log_text("Wake word detected.")
-
-                speak(LISTENING_PROMPT)
-                
-                # 3. Listen for Initial Command
-                command_text = listen_for_command()
-                
-                if command_text:
-                    if gui:
-                        gui.log_text(f"User command: {command_text}")
-                    # Inner loop for follow-up commands/conversational turn
-                    while True:
-                        # 4. Process Command with Gemini NLU
-                        nlu_result = parse_command_with_gemini(command_text)
-                        
-                        # 5. Execute Action
-                        # execute_action now returns True if a follow-up listen is needed
-                        should_relisten = execute_action(nlu_result, command_text) 
-                        
-                        if should_relisten:
-                            # 6. Listen for Follow-up Command
-                            print("System prompted user. Listening for follow-up...")
-                            if gui:
-                                gui.log_text(f"Prompted follow-up: {command_text}")
-                            command_text = listen_for_command()
-                            if not command_text:
-                                # User didn't respond to the prompt, break out to wake word mode
-                                speak("No response heard. Returning to wake word detection.")
-                                break 
-                        else:
-                            # Action complete (or failed but required no follow-up), exit inner loop
-                            break 
-
-                if gui:
-                    gui.set_listening(False)
-                    gui.update_status("Status: Idle")
-
-            time.sleep(0.1) # Small delay to prevent high CPU usage
+        # Not asyncio.run(): its SIGINT handler would defer Ctrl+C until the
+        # current blocking listen returns, which can be indefinitely.
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(_assistant_loop(gui))
+        finally:
+            loop.close()
 
     except KeyboardInterrupt:
         logger.info("Alpha manually stopped by user (Ctrl+C).")
-        speak("Goodbye.")
+        speak_blocking("Goodbye.")
     except Exception as e:
         logger.critical(f"A fatal unhandled error occurred: {e}")
-        speak("A critical error has occurred and Alpha is shutting down.")
+        speak_blocking("A critical error has occurred and Alpha is shutting down.")
         
     logger.info("--- Alpha Voice Assistant Shut Down ---")
 
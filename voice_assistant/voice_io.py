@@ -2,16 +2,18 @@
 # Handles speech recognition and text-to-speech functionality
 
 import speech_recognition as sr
+import atexit
+import json
 import subprocess
 import platform
 import logging
+import re
 import time
-import win32com.client as wincl
 
 try:
-    from .config import TTS_RATE, TTS_VOLUME, WAKE_WORD
+    from .config import TTS_RATE, TTS_VOLUME, WAKE_WORD, VOSK_MODEL_PATH
 except ImportError:
-    from config import TTS_RATE, TTS_VOLUME, WAKE_WORD
+    from config import TTS_RATE, TTS_VOLUME, WAKE_WORD, VOSK_MODEL_PATH
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,33 @@ r.pause_threshold = 1.2   # Silence duration before command completion
 
 # Text-to-speech engine instance
 tts_engine = None
+# SAPI SpeechVoiceSpeakFlags.SVSFlagsAsync: Speak() queues the text and returns
+_SVSF_ASYNC = 1
+
+# Microphone shared by every listen call. It is opened and calibrated once
+# instead of per call; the recognizer's dynamic energy threshold keeps
+# adapting to background noise while listening. 16 kHz suits both Vosk and Google.
+_mic = None
+_SAMPLE_RATE = 16000
+
+# Offline (Vosk) model and recognizers, created on first use. They stay None
+# when vosk or its model is unavailable, in which case Google is used instead.
+_vosk_model = None
+_vosk_model_checked = False
+_wake_recognizer = None
+_wake_recognizer_checked = False
+_short_response_recognizer = None
+_WAKE_ATTEMPT_SECONDS = 5  # Same window as the Google path's phrase_time_limit
+
+# Whole-word match, so e.g. "assistantship" doesn't wake "assistant"
+_WAKE_LOWER = WAKE_WORD.lower()
+_WAKE_RE = re.compile(rf"\b{re.escape(_WAKE_LOWER)}\b")
+
+# Vocabulary for the offline yes/no recognizer; anything else comes out as [unk]
+_SHORT_RESPONSE_WORDS = ["yes", "yeah", "yup", "sure", "save", "ok", "okay", "no", "nope", "cancel"]
+
+# Number of Google STT hypotheses handed to the NLU for one command
+_MAX_ALTERNATIVES = 3
 
 
 def initialize_tts():
@@ -29,6 +58,8 @@ def initialize_tts():
     global tts_engine
     if tts_engine is None and platform.system() == "Windows":
         try:
+            # Windows-only dependency, imported here so other platforms can load this module
+            import win32com.client as wincl
             tts_engine = wincl.Dispatch("SAPI.SpVoice")
             
             sapi_rate = int((TTS_RATE - 175) / 12.5) 
@@ -44,99 +75,269 @@ def initialize_tts():
         logger.warning("TTS not initialized. Running on non-Windows OS or initialization failed.")
 
 def speak(text):
-    """Speaks the given text using the win32com SAPI engine."""
+    """
+    Speaks the given text using the win32com SAPI engine. The text is queued
+    and plays in the background, so the caller can carry on (open the app,
+    update the GUI) while Alpha talks. Every listen function waits for queued
+    speech to finish first, so Alpha never hears itself.
+    """
     global tts_engine
     logger.info(f"Alpha: {text}")
     
     if tts_engine:
         try:
-            tts_engine.Speak(text, 0) # Synchronous flag (blocks until done)
+            tts_engine.Speak(text, _SVSF_ASYNC)
         except Exception as e:
             logger.error(f"Error speaking with win32com: {e}")
             print(f"Alpha (TTS FAILED): {text}") 
     else:
         print(f"Alpha (TTS ENGINE OFFLINE): {text}")
 
+def wait_until_done():
+    """Blocks until all speech queued by speak() has finished playing."""
+    if tts_engine:
+        try:
+            tts_engine.WaitUntilDone(-1)
+        except Exception as e:
+            logger.error(f"Error waiting for win32com speech: {e}")
 
-def listen_for_wake_word():
-    """Continuously listens for the wake word."""
-    with sr.Microphone() as source:
-        r.adjust_for_ambient_noise(source, duration=1.0) 
-        logger.info(f"Waiting for wake word: '{WAKE_WORD}'...")
+def speak_blocking(text):
+    """Speaks the given text and returns only once it has been spoken."""
+    speak(text)
+    wait_until_done()
 
-        try:
-            audio = r.listen(source, timeout=None, phrase_time_limit=5)
-            text = r.recognize_google(audio).lower()
-            logger.debug(f"Wake word attempt heard: '{text}'")
 
-            if WAKE_WORD.lower() in text:
-                logger.info("Wake word detected!")
-                return True
-        
-        except sr.WaitTimeoutError:
-            pass
-        except sr.UnknownValueError:
-            logger.debug("Speech not clear or no speech detected.")
-        except sr.RequestError as e:
-            logger.error(f"Could not request results from Google Speech Recognition service: {e}")
+def _get_mic():
+    """Returns the shared, already-open microphone, opening and calibrating it on first use."""
+    global _mic
+    if _mic is None:
+        mic = sr.Microphone(sample_rate=_SAMPLE_RATE)
+        mic.__enter__()
+        atexit.register(mic.__exit__, None, None, None)
+        logger.info("Calibrating microphone for ambient noise...")
+        r.adjust_for_ambient_noise(mic, duration=1.0)
+        _mic = mic
+    return _mic
 
-    return False
 
-def listen_for_command():
-    """Listens for a command after the wake word is detected."""
-    with sr.Microphone() as source:
-        r.adjust_for_ambient_noise(source, duration=0.5) 
-        logger.info("Listening for command...")
+def _ready_mic():
+    """
+    Waits for queued speech to finish and returns the shared microphone with
+    the audio it buffered meanwhile discarded. The stream keeps capturing while
+    nobody reads it (TTS, NLU, actions), so without this a listen would start
+    on stale frames that may contain Alpha's own voice.
+    """
+    wait_until_done()
+    source = _get_mic()
+    try:
+        pending = source.stream.pyaudio_stream.get_read_available()
+        if pending > 0:
+            source.stream.read(pending)
+    except Exception as e:
+        logger.debug(f"Could not flush the microphone buffer: {e}")
+    return source
 
+
+def _get_vosk_model():
+    """Loads the Vosk model once; returns None if vosk or the model is unavailable."""
+    global _vosk_model, _vosk_model_checked
+    if not _vosk_model_checked:
+        _vosk_model_checked = True
         try:
-            audio = r.listen(source, timeout=8, phrase_time_limit=30)
-            
-            command = r.recognize_google(audio)
-            logger.info(f"Command received: '{command}'")
-            return command
-            
-        except sr.WaitTimeoutError:
-            speak("I didn't hear a command. Returning to sleep mode.")
-            return None
-        except sr.UnknownValueError:
-            speak("Sorry, I could not understand the audio. Please speak clearly.")
-            return None
-        except sr.RequestError as e:
-            speak("Sorry, my speech service is currently unavailable.")
-            logger.error(f"Speech service error: {e}")
-            return None
+            import vosk
+            vosk.SetLogLevel(-1)
+            _vosk_model = vosk.Model(VOSK_MODEL_PATH)
+            logger.info("Offline (Vosk) recognition enabled.")
         except Exception as e:
-            logger.error(f"An unexpected error occurred during listening: {e}")
-            speak("An internal error occurred. Please check the logs.")
+            logger.warning(f"Offline recognition unavailable ({e}). Using Google Speech Recognition.")
+    return _vosk_model
+
+
+def _make_grammar_recognizer(words):
+    """Builds a Vosk recognizer restricted to the given words, or None without a model."""
+    model = _get_vosk_model()
+    if model is None:
+        return None
+    import vosk
+    # A restricted grammar keeps recognition fast and accurate for tiny vocabularies
+    return vosk.KaldiRecognizer(model, _SAMPLE_RATE, json.dumps(words + ["[unk]"]))
+
+
+def _get_wake_recognizer():
+    """
+    Returns the shared Vosk recognizer for the wake word, or None if unavailable.
+    Vosk silently drops grammar words missing from its model, which would leave
+    a recognizer that can never wake, so such wake words use Google instead.
+    """
+    global _wake_recognizer, _wake_recognizer_checked
+    if not _wake_recognizer_checked:
+        _wake_recognizer_checked = True
+        model = _get_vosk_model()
+        if model is None:
             return None
+        missing = [word for word in _WAKE_LOWER.split() if model.find_word(word) == -1]
+        if missing:
+            logger.warning(f"Wake word '{WAKE_WORD}' has words the Vosk model doesn't know "
+                           f"({', '.join(missing)}). Using Google Speech Recognition for the wake word.")
+            return None
+        _wake_recognizer = _make_grammar_recognizer([_WAKE_LOWER])
+    return _wake_recognizer
+
+
+def _get_short_response_recognizer():
+    """Returns the shared Vosk recognizer for yes/no replies, or None if unavailable."""
+    global _short_response_recognizer
+    if _short_response_recognizer is None:
+        _short_response_recognizer = _make_grammar_recognizer(_SHORT_RESPONSE_WORDS)
+    return _short_response_recognizer
+
 
+def _recognize_short_response_offline(recognizer, audio):
+    """Decodes a short reply locally; returns None if no known word was heard."""
+    recognizer.Reset()
+    recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=_SAMPLE_RATE, convert_width=2))
+    words = [w for w in json.loads(recognizer.FinalResult()).get("text", "").split() if w != "[unk]"]
+    return " ".join(words) or None
 
-def listen_for_short_response(timeout: float = 4.0, phrase_time_limit: float = 3.0):
+
+def _listen_for_wake_word_offline(recognizer):
+    """Spots the wake word locally with Vosk; no audio leaves the machine."""
+    recognizer.Reset()
+    source = _ready_mic()
+    logger.info(f"Waiting for wake word: '{WAKE_WORD}'...")
+    for _ in range(int(_WAKE_ATTEMPT_SECONDS * _SAMPLE_RATE / source.CHUNK)):
+        data = source.stream.read(source.CHUNK)
+        if recognizer.AcceptWaveform(data):
+            text = json.loads(recognizer.Result()).get("text", "")
+        else:
+            # Partial results let us react before the utterance ends
+            text = json.loads(recognizer.PartialResult()).get("partial", "")
+
+        if _WAKE_RE.search(text):
+            logger.info("Wake word detected!")
+            return True
+    return False
+
+
+def listen_for_wake_word():
+    """Continuously listens for the wake word."""
+    recognizer = _get_wake_recognizer()
+    if recognizer is not None:
+        return _listen_for_wake_word_offline(recognizer)
+
+    source = _ready_mic()
+    logger.info(f"Waiting for wake word: '{WAKE_WORD}'...")
+
+    try:
+        audio = r.listen(source, timeout=None, phrase_time_limit=5)
+        text = r.recognize_google(audio).lower()
+        logger.debug(f"Wake word attempt heard: '{text}'")
+
+        if _WAKE_RE.search(text):
+            logger.info("Wake word detected!")
+            return True
+    
+    except sr.WaitTimeoutError:
+        pass
+    except sr.UnknownValueError:
+        logger.debug("Speech not clear or no speech detected.")
+    except sr.RequestError as e:
+        logger.error(f"Could not request results from Google Speech Recognition service: {e}")
+
+    return False
+
+def listen_for_command_alternatives(quiet: bool = False):
+    """
+    Listens for a command after the wake word is detected and returns the
+    distinct transcriptions Google proposed, most likely first (at most
+    _MAX_ALTERNATIVES). Returns an empty list if nothing was understood.
+
+    With quiet=True failures are only logged, not spoken, so the caller can
+    choose its own re-prompt or goodbye message.
+    """
+    def feedback(message):
+        if quiet:
+            logger.info(f"Command listen failed: {message}")
+        else:
+            speak(message)
+
+    source = _ready_mic()
+    logger.info("Listening for command...")
+
+    try:
+        audio = r.listen(source, timeout=8, phrase_time_limit=30)
+        
+        result = r.recognize_google(audio, show_all=True)
+        alternatives = []
+        # show_all returns [] instead of raising when nothing was recognized
+        for alternative in (result.get('alternative', []) if isinstance(result, dict) else []):
+            transcript = alternative.get('transcript', '').strip()
+            if transcript and transcript.lower() not in (a.lower() for a in alternatives):
+                alternatives.append(transcript)
+            if len(alternatives) == _MAX_ALTERNATIVES:
+                break
+        if not alternatives:
+            raise sr.UnknownValueError()
+        logger.info(f"Command received: '{alternatives[0]}' (alternatives: {alternatives[1:]})")
+        return alternatives
+        
+    except sr.WaitTimeoutError:
+        feedback("I didn't hear a command. Returning to sleep mode.")
+        return []
+    except sr.UnknownValueError:
+        feedback("Sorry, I could not understand the audio. Please speak clearly.")
+        return []
+    except sr.RequestError as e:
+        feedback("Sorry, my speech service is currently unavailable.")
+        logger.error(f"Speech service error: {e}")
+        return []
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during listening: {e}")
+        feedback("An internal error occurred. Please check the logs.")
+        return []
+
+
+def _recognize_short_response(timeout, phrase_time_limit):
+    """Listens once on the shared microphone and returns the recognized text or None."""
+    source = _ready_mic()
+    try:
+        audio = r.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+        # Answer yes/no locally when possible; Google handles anything off-vocabulary
+        recognizer = _get_short_response_recognizer()
+        response = _recognize_short_response_offline(recognizer, audio) if recognizer else None
+        if response is None:
+            response = r.recognize_google(audio)
+        logger.info(f"Short response received: '{response}'")
+        return response
+    except sr.WaitTimeoutError:
+        logger.debug("Short response: wait timeout")
+        return None
+    except sr.UnknownValueError:
+        logger.debug("Short response: could not understand audio")
+        return None
+    except sr.RequestError as e:
+        logger.error(f"Short response: speech service error: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Short response: unexpected error: {e}")
+        return None
+
+
+def listen_for_short_response(timeout: float = 4.0, phrase_time_limit: float = 3.0,
+                              retry_prompt: str = None):
     """Listen for a short yes/no response with tighter time limits.
 
     This helper reduces the phrase_time_limit and timeout to better capture
     single-word replies like 'yes' or 'no'. It returns the recognized text
     (string) or None if nothing understandable was heard.
+
+    If retry_prompt is given and the first attempt hears nothing usable, the
+    prompt is spoken and a second attempt is made right away.
     """
-    with sr.Microphone() as source:
-        # Short ambient adjustment for quick responses
-        r.adjust_for_ambient_noise(source, duration=0.4)
-        logger.info("Listening for short response...")
+    logger.info("Listening for short response...")
 
-        try:
-            audio = r.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
-            response = r.recognize_google(audio)
-            logger.info(f"Short response received: '{response}'")
-            return response
-        except sr.WaitTimeoutError:
-            logger.debug("Short response: wait timeout")
-            return None
-        except sr.UnknownValueError:
-            logger.debug("Short response: could not understand audio")
-            return None
-        except sr.RequestError as e:
-            logger.error(f"Short response: speech service error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Short response: unexpected error: {e}")
-            return None
\ No newline at end of file
+    response = _recognize_short_response(timeout, phrase_time_limit)
+    if response is None and retry_prompt:
+        speak(retry_prompt)
+        response = _recognize_short_response(timeout, phrase_time_limit)
+    return response